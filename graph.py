@@ -1,9 +1,14 @@
-import json
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from pandas.io.json import ujson_loads
 import matplotlib
 matplotlib.use('Agg')  # Set backend before importing pyplot
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
@@ -12,6 +17,11 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # print(plt.style.available)
 # exit()
 
@@ -19,21 +29,75 @@ from datetime import datetime
 OUTPUT_DIR = 'graphs'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+def _load_report(path):
+    with open(path, 'rb') as file:
+        raw = file.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Reports written by the stdlib json module may contain NaN
+            pass
+    return ujson_loads(raw.decode('utf-8'))
+
 # Read JSON data
-with open('reports/comprehensive_report.json', 'r') as file:
-    data = json.load(file)
+data = _load_report('reports/comprehensive_report.json')
+
+# Build the course and teacher frames once and share them across plots and PDFs
+_COURSES_DF = pd.DataFrame.from_records(data['past_classes']['all_courses'])
+_COURSES_DF = _COURSES_DF.astype({'class_count': 'int32', 'avg_duration': 'float32', 'class_type': 'category'})
+_TEACHERS_DF = pd.DataFrame.from_records(data['teacher_usage']['all_teachers_metrics'])
+_TEACHERS_DF = _TEACHERS_DF.sort_values('total_classes', ascending=False)
+
+def _top_n(df, column, n=10):
+    # Same rows and order as df.nlargest(n, column), using an O(N) partition instead of a full sort
+    values = df[column].to_numpy(dtype='float64')
+    missing = np.isnan(values)
+    positions = np.flatnonzero(~missing)
+    values = values[positions]
+    if len(values) > n:
+        kth = np.partition(values, -n)[-n]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:n - len(above)]
+        keep = np.concatenate([above, ties])
+    else:
+        keep = np.arange(len(values))
+    keep = positions[keep[np.argsort(-values[keep], kind='stable')]]
+    # Like nlargest, pad with NaN rows when there are fewer than n values
+    keep = np.concatenate([keep, np.flatnonzero(missing)[:n - len(keep)]])
+    return df.iloc[keep]
 
 def setup_plot_style():
     plt.style.use('seaborn-v0_8-pastel')
     sns.set_palette("husl")
 
-def save_plot(filename):
-    plt.tight_layout()
-    filepath = os.path.join(OUTPUT_DIR, filename)
-    plt.savefig(filepath, dpi=300, bbox_inches='tight')
-    plt.close()
+def new_figure(figsize):
+    # Plain Agg figure, not registered with pyplot, so nothing is retained after saving
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
 
-def plot_class_distribution():
+def reset_figure(fig, figsize):
+    fig.clear()
+    fig.set_size_inches(figsize)
+
+def bar_plot(ax, df, x, y):
+    # One bar per row; plain bars skip seaborn's bootstrapped error bars
+    positions = np.arange(len(df))
+    color = sns.desaturate(sns.color_palette()[0], 0.75)  # seaborn's default bar saturation
+    ax.bar(positions, df[y].to_numpy(), color=color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(df[x].astype(str), rotation=45, ha='right')
+    ax.set_xlim(-0.5, len(df) - 0.5)
+
+def render_plot(fig):
+    # Keep the PNG in memory; the final report embeds it directly
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=150)
+    return buf.getvalue()
+
+def plot_class_distribution(fig):
     labels = ['On Time', 'Late', 'Extra Class']
     values = [
         data['past_classes']['entry_type_distribution']['on_time'],
@@ -41,113 +105,135 @@ def plot_class_distribution():
         data['past_classes']['entry_type_distribution']['EXTRA_CLASS']
     ]
     
-    plt.figure(figsize=(10, 8))
+    reset_figure(fig, (10, 8))
+    ax = fig.add_subplot()
     colors = ['#2ecc71', '#e74c3c', '#3498db']  # green, red, blue
-    plt.pie(values, labels=labels, autopct='%1.1f%%', colors=colors)
-    plt.title('Distribution of Class Types')
-    save_plot('class_distribution.png')
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=colors)
+    ax.set_title('Distribution of Class Types')
+    return render_plot(fig)
 
-def plot_top_courses():
-    courses_df = pd.DataFrame(data['past_classes']['all_courses'])
-    top_10 = courses_df.nlargest(10, 'class_count')
-    
-    plt.figure(figsize=(12, 6))
-    sns.barplot(data=top_10, x='course_code', y='class_count')
-    plt.xticks(rotation=45, ha='right')
-    plt.title('Top 10 Courses by Number of Classes')
-    plt.xlabel('Course Code')
-    plt.ylabel('Number of Classes')
-    save_plot('top_10_courses.png')
+def plot_top_courses(fig):
+    top_10 = _top_n(_COURSES_DF, 'class_count')
+    
+    reset_figure(fig, (12, 6))
+    ax = fig.add_subplot()
+    bar_plot(ax, top_10, 'course_code', 'class_count')
+    ax.set_title('Top 10 Courses by Number of Classes')
+    ax.set_xlabel('Course Code')
+    ax.set_ylabel('Number of Classes')
+    return render_plot(fig)
 
-def plot_course_durations():
-    courses_df = pd.DataFrame(data['past_classes']['all_courses'])
-    
+def plot_course_durations(fig):
     # Separate theory and lab courses
-    theory_courses = courses_df[courses_df['class_type'] == 'theory'].nlargest(10, 'avg_duration')
-    lab_courses = courses_df[courses_df['class_type'] == 'lab'].nlargest(10, 'avg_duration')
+    theory_courses = _top_n(_COURSES_DF[_COURSES_DF['class_type'] == 'theory'], 'avg_duration')
+    lab_courses = _top_n(_COURSES_DF[_COURSES_DF['class_type'] == 'lab'], 'avg_duration')
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    reset_figure(fig, (12, 10))
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Theory courses plot
-    sns.barplot(data=theory_courses, x='course_code', y='avg_duration', ax=ax1)
-    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45, ha='right')
+    bar_plot(ax1, theory_courses, 'course_code', 'avg_duration')
     ax1.set_title('Top 10 Theory Courses by Average Duration')
     ax1.set_xlabel('Course Code')
     ax1.set_ylabel('Average Duration (minutes)')
     
     # Lab courses plot
-    sns.barplot(data=lab_courses, x='course_code', y='avg_duration', ax=ax2)
-    ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45, ha='right')
+    bar_plot(ax2, lab_courses, 'course_code', 'avg_duration')
     ax2.set_title('Top 10 Lab Courses by Average Duration')
     ax2.set_xlabel('Course Code')
     ax2.set_ylabel('Average Duration (minutes)')
     
-    save_plot('course_durations.png')
+    return render_plot(fig)
 
-def plot_ontime_vs_late():
+def plot_ontime_vs_late(fig):
     total = data['past_classes']['total_classes']
     ontime = data['past_classes']['on_time_classes']
     late = data['past_classes']['late_classes']
     
-    plt.figure(figsize=(8, 6))
-    plt.bar(['On Time', 'Late'], [ontime, late])
-    plt.title('On-Time vs Late Classes')
-    plt.ylabel('Number of Classes')
-    save_plot('ontime_vs_late.png')
-
-def plot_top_teachers():
-    teachers_df = pd.DataFrame(data['teacher_usage']['all_teachers_metrics'])
-    top_10_teachers = teachers_df.nlargest(10, 'total_classes')
-    
-    plt.figure(figsize=(12, 6))
-    sns.barplot(data=top_10_teachers, x='first_name', y='total_classes')
-    plt.xticks(rotation=45, ha='right')
-    plt.title('Top 10 Teachers by Total Classes')
-    plt.xlabel('Teacher Name')
-    plt.ylabel('Number of Classes')
-    save_plot('top_teachers.png')
-
-def plot_most_missed_classes():
+    reset_figure(fig, (8, 6))
+    ax = fig.add_subplot()
+    ax.bar(['On Time', 'Late'], [ontime, late])
+    ax.set_title('On-Time vs Late Classes')
+    ax.set_ylabel('Number of Classes')
+    return render_plot(fig)
+
+def plot_top_teachers(fig):
+    top_10_teachers = _top_n(_TEACHERS_DF, 'total_classes')
+    
+    reset_figure(fig, (12, 6))
+    ax = fig.add_subplot()
+    bar_plot(ax, top_10_teachers, 'first_name', 'total_classes')
+    ax.set_title('Top 10 Teachers by Total Classes')
+    ax.set_xlabel('Teacher Name')
+    ax.set_ylabel('Number of Classes')
+    return render_plot(fig)
+
+def plot_most_missed_classes(fig):
     teachers_df = pd.DataFrame(data['missed_classes']['teachers_with_most_missed'])
     
-    plt.figure(figsize=(12, 6))
-    sns.barplot(data=teachers_df, x='first_name', y='missed_count')
-    plt.xticks(rotation=45, ha='right')
-    plt.title('Teachers with Most Missed Classes')
-    plt.xlabel('Teacher Name')
-    plt.ylabel('Number of Missed Classes')
-    save_plot('most_missed_classes.png')
+    reset_figure(fig, (12, 6))
+    ax = fig.add_subplot()
+    bar_plot(ax, teachers_df, 'first_name', 'missed_count')
+    ax.set_title('Teachers with Most Missed Classes')
+    ax.set_xlabel('Teacher Name')
+    ax.set_ylabel('Number of Missed Classes')
+    return render_plot(fig)
+
+_TEACHER_TABLE_HEADERS = ('#', 'Teacher Name', 'Total Classes', 'Late Classes', 'Missed Classes', 'Late %')
+
+# Table styles are built once and shared by every table that uses them
+_TEACHER_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),  # Bold for totals
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+])
+
+_REPORT_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E5A88')),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+def _build_teacher_rows(teachers_df):
+
+    # Format each column in one pass instead of row by row
+    names = (teachers_df['first_name'].astype(str) + ' ' + teachers_df['last_name'].astype(str)).tolist()
+    total = teachers_df['total_classes'].map('{:.0f}'.format).tolist()
+    late = teachers_df['late_classes'].map('{:.0f}'.format).tolist()
+    missed = teachers_df['missed_classes'].map('{:.0f}'.format).tolist()
+    late_pct = teachers_df['late_percentage'].map('{:.1f}%'.format).tolist()
+    rows = [list(_TEACHER_TABLE_HEADERS)] + [
+        [str(i), n, t, l, m, p]
+        for i, (n, t, l, m, p) in enumerate(zip(names, total, late, missed, late_pct), start=1)
+    ]
+
+    # Calculate totals once
+    tc = teachers_df['total_classes'].sum()
+    lc = teachers_df['late_classes'].sum()
+    mc = teachers_df['missed_classes'].sum()
+    total_row = ['', 'TOTAL',  # Empty string for index in total row
+                 f"{tc:.0f}",
+                 f"{lc:.0f}",
+                 f"{mc:.0f}",
+                 f"{(lc / tc * 100):.1f}%"]
+    return rows, total_row
 
 def generate_teacher_table():
-    teachers_df = pd.DataFrame(data['teacher_usage']['all_teachers_metrics'])
-    teachers_df = teachers_df.sort_values('total_classes', ascending=False)
-    
-    # Calculate totals
-    total_row = ['TOTAL',
-                 f"{teachers_df['total_classes'].sum():.0f}",
-                 f"{teachers_df['late_classes'].sum():.0f}", 
-                 f"{teachers_df['missed_classes'].sum():.0f}",
-                 f"{(teachers_df['late_classes'].sum() / teachers_df['total_classes'].sum() * 100):.1f}%"]
-    
     # Prepare data for PDF
-    data_rows = []
-    headers = ['#', 'Teacher Name', 'Total Classes', 'Late Classes', 'Missed Classes', 'Late %']
-    data_rows.append(headers)
-    
-    for idx, row in teachers_df.iterrows():
-        data_rows.append([
-            str(len(data_rows)),  # Add index number
-            f"{row['first_name']} {row['last_name']}",
-            f"{row['total_classes']:.0f}",
-            f"{row['late_classes']:.0f}",
-            f"{row['missed_classes']:.0f}",
-            f"{row['late_percentage']:.1f}%"
-        ])
-    data_rows.append(['', 'TOTAL',  # Empty string for index in total row
-                     f"{teachers_df['total_classes'].sum():.0f}",
-                     f"{teachers_df['late_classes'].sum():.0f}", 
-                     f"{teachers_df['missed_classes'].sum():.0f}",
-                     f"{(teachers_df['late_classes'].sum() / teachers_df['total_classes'].sum() * 100):.1f}%"])
+    data_rows, total_row = _build_teacher_rows(_TEACHERS_DF)
+    data_rows.append(total_row)
 
     # Create PDF
     pdf_path = os.path.join(OUTPUT_DIR, 'teacher_metrics.pdf')
@@ -161,23 +247,13 @@ def generate_teacher_table():
     )
     
     # Create table
-    table = Table(data_rows, repeatRows=1)
-    table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),  # Bold for totals
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-    ]))
+    table = Table(data_rows, repeatRows=1, style=_TEACHER_TABLE_STYLE)
     
     # Build PDF
     doc.build([table])
     print(f"Teacher metrics PDF generated at: {pdf_path}")
 
-def generate_final_report():
+def generate_final_report(images):
     pdf_path = os.path.join(OUTPUT_DIR, 'final_report.pdf')
     doc = SimpleDocTemplate(
         pdf_path,
@@ -257,8 +333,19 @@ def generate_final_report():
     story.append(Paragraph("Executive Summary", section_style))
     
     # Overall Statistics
-    total_classes = data['past_classes']['total_classes']
-    total_teachers = data['teacher_usage']['total_summary']['total_teachers']
+    pc = data['past_classes']
+    tu = data['teacher_usage']
+    mc = data['missed_classes']
+    dist = pc['entry_type_distribution']
+    courses = pc['all_courses']
+    teachers = tu['all_teachers_metrics']
+    top_course = courses[0]
+    top_teacher = teachers[0]
+    avg_top10 = _COURSES_DF['avg_duration'].iloc[:10].mean()
+    busy_courses = int((_COURSES_DF['class_count'] > 100).sum())
+    top10_teacher_classes = int(_TEACHERS_DF['total_classes'].iloc[:10].sum())
+    total_classes = pc['total_classes']
+    total_teachers = tu['total_summary']['total_teachers']
     
     # Define summary style with better spacing
     summary_style = ParagraphStyle(
@@ -279,32 +366,28 @@ def generate_final_report():
 
 • Total Classes Conducted: {total_classes}<br/>
 • Total Teachers: {total_teachers}<br/>
-• On-time Classes: {data['past_classes']['on_time_classes']} ({data['past_classes']['entry_type_distribution']['on_time']} classes)<br/>
-• Late Classes: {data['past_classes']['late_classes']} ({data['past_classes']['entry_type_distribution']['late']} classes)<br/>
-• Extra Classes: {data['past_classes']['entry_type_distribution']['EXTRA_CLASS']} classes<br/>
+• On-time Classes: {pc['on_time_classes']} ({dist['on_time']} classes)<br/>
+• Late Classes: {pc['late_classes']} ({dist['late']} classes)<br/>
+• Extra Classes: {dist['EXTRA_CLASS']} classes<br/>
 
 <br/><b>Course Analysis</b><br/>
 
-• Most Active Course: {data['past_classes']['all_courses'][0]['course_code']} with {data['past_classes']['all_courses'][0]['class_count']} classes<br/>
-• Average Theory Class Duration: {data['past_classes']['average_durations'].get('theory', 0):.1f} minutes<br/>
-• Average Lab Class Duration: {data['past_classes']['average_durations'].get('lab', 0):.1f} minutes<br/>
-
-<br/><b>Course Analysis</b><br/>
-
-• Most Active Course: {data['past_classes']['all_courses'][0]['course_code']} with {data['past_classes']['all_courses'][0]['class_count']} classes<br/>
-• Average Course Duration: {sum(c['avg_duration'] for c in data['past_classes']['all_courses'][:10])/10:.1f} minutes for top 10 courses<br/>
+• Most Active Course: {top_course['course_code']} with {top_course['class_count']} classes<br/>
+• Average Theory Class Duration: {pc['average_durations'].get('theory', 0):.1f} minutes<br/>
+• Average Lab Class Duration: {pc['average_durations'].get('lab', 0):.1f} minutes<br/>
+• Average Course Duration: {avg_top10:.1f} minutes for top 10 courses<br/>
 
 <br/><b>Teacher Performance</b><br/>
 
-• Total Missed Classes: {data['missed_classes']['total_missed_classes']}<br/>
-• Top Performing Teacher: {data['teacher_usage']['all_teachers_metrics'][0]['first_name']} {data['teacher_usage']['all_teachers_metrics'][0]['last_name']} with {data['teacher_usage']['all_teachers_metrics'][0]['total_classes']} classes<br/>
-• Average Late Percentage: {data['past_classes']['late_percentage']:.1f}%<br/>
+• Total Missed Classes: {mc['total_missed_classes']}<br/>
+• Top Performing Teacher: {top_teacher['first_name']} {top_teacher['last_name']} with {top_teacher['total_classes']} classes<br/>
+• Average Late Percentage: {pc['late_percentage']:.1f}%<br/>
 
 <br/><b>Key Findings</b><br/>
 
-• {data['past_classes']['late_percentage']:.1f}% of all classes started late<br/>
-• {len([c for c in data['past_classes']['all_courses'] if c['class_count'] > 100])} courses had more than 100 classes<br/>
-• Top 10 teachers conducted {sum(t['total_classes'] for t in data['teacher_usage']['all_teachers_metrics'][:10])} classes<br/>
+• {pc['late_percentage']:.1f}% of all classes started late<br/>
+• {busy_courses} courses had more than 100 classes<br/>
+• Top 10 teachers conducted {top10_teacher_classes} classes<br/>
 </para>"""
 
     story.append(Paragraph(overall_stats, summary_style))
@@ -312,12 +395,10 @@ def generate_final_report():
     
     # Class Distribution Analysis
     story.append(Paragraph("Class Distribution Analysis", section_style))
-    img_path = os.path.join(OUTPUT_DIR, 'class_distribution.png')
-    img = Image(img_path, width=300, height=240)
+    img = Image(io.BytesIO(images['class_distribution']), width=300, height=240)
     story.append(img)
     
-    img_path = os.path.join(OUTPUT_DIR, 'ontime_vs_late.png')
-    img = Image(img_path, width=300, height=240)
+    img = Image(io.BytesIO(images['ontime_vs_late']), width=300, height=240)
     story.append(img)
     story.append(PageBreak())
     
@@ -330,83 +411,67 @@ def generate_final_report():
     
     # Course Analysis
     story.append(Paragraph("Course Analysis", section_style))
-    img_path = os.path.join(OUTPUT_DIR, 'top_10_courses.png')
-    img = Image(img_path, width=450, height=250)
+    img = Image(io.BytesIO(images['top_10_courses']), width=450, height=250)
     story.append(img)
     
-    img_path = os.path.join(OUTPUT_DIR, 'course_durations.png')
-    img = Image(img_path, width=450, height=250)
+    img = Image(io.BytesIO(images['course_durations']), width=450, height=250)
     story.append(img)
     story.append(PageBreak())
     
     # Teacher Performance
     story.append(Paragraph("Teacher Performance Analysis", section_style))
-    img_path = os.path.join(OUTPUT_DIR, 'top_teachers.png')
-    img = Image(img_path, width=450, height=250)
+    img = Image(io.BytesIO(images['top_teachers']), width=450, height=250)
     story.append(img)
     
-    img_path = os.path.join(OUTPUT_DIR, 'most_missed_classes.png')
-    img = Image(img_path, width=450, height=250)
+    img = Image(io.BytesIO(images['most_missed_classes']), width=450, height=250)
     story.append(img)
     story.append(PageBreak())
     
     # Teacher Metrics Table
     story.append(Paragraph("Detailed Teacher Metrics", section_style))
-    teachers_df = pd.DataFrame(data['teacher_usage']['all_teachers_metrics'])
-    teachers_df = teachers_df.sort_values('total_classes', ascending=False)
-    
-    data_rows = [['#', 'Teacher Name', 'Total Classes', 'Late Classes', 'Missed Classes', 'Late %']]
-    
-    for idx, row in teachers_df.iterrows():
-        data_rows.append([
-            str(len(data_rows)),  # Add index number
-            f"{row['first_name']} {row['last_name']}",
-            f"{row['total_classes']:.0f}",
-            f"{row['late_classes']:.0f}",
-            f"{row['missed_classes']:.0f}",
-            f"{row['late_percentage']:.1f}%"
-        ])
-    
-    total_row = ['TOTAL',
-                 f"{teachers_df['total_classes'].sum():.0f}",
-                 f"{teachers_df['late_classes'].sum():.0f}", 
-                 f"{teachers_df['missed_classes'].sum():.0f}",
-                 f"{(teachers_df['late_classes'].sum() / teachers_df['total_classes'].sum() * 100):.1f}%"]
-    data_rows.append(['', 'TOTAL',  # Empty string for index in total row
-                     f"{teachers_df['total_classes'].sum():.0f}",
-                     f"{teachers_df['late_classes'].sum():.0f}", 
-                     f"{teachers_df['missed_classes'].sum():.0f}",
-                     f"{(teachers_df['late_classes'].sum() / teachers_df['total_classes'].sum() * 100):.1f}%"])
-    
-    table = Table(data_rows, repeatRows=1, style=TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E5A88')),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    data_rows, total_row = _build_teacher_rows(_TEACHERS_DF)
+    data_rows.append(total_row)
+    
+    table = Table(data_rows, repeatRows=1, style=_REPORT_TABLE_STYLE)
     story.append(table)
     
     # Build PDF with page numbers
     doc.build(story)
     print(f"Final report generated at: {pdf_path}")
 
+PLOT_FUNCTIONS = {
+    'class_distribution': plot_class_distribution,
+    'top_10_courses': plot_top_courses,
+    'course_durations': plot_course_durations,
+    'ontime_vs_late': plot_ontime_vs_late,
+    'top_teachers': plot_top_teachers,
+    'most_missed_classes': plot_most_missed_classes,
+}
+
+# Figure reused by every plot a worker process renders
+_worker_fig = None
+
+def _init_plot_worker():
+    global _worker_fig
+    setup_plot_style()
+    _worker_fig = new_figure((12, 8))
+
+def _run_plot(plot_function):
+    return plot_function(_worker_fig)
+
 def generate_all_plots():
     try:
-        setup_plot_style()
-        plot_class_distribution()
-        plot_top_courses()
-        plot_course_durations()
-        plot_ontime_vs_late()
-        plot_top_teachers()
-        plot_most_missed_classes()
-        generate_teacher_table()
-        generate_final_report()  # Add this line
+        # Each plot is independent, so render them in separate processes
+        workers = min(len(PLOT_FUNCTIONS), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_plot_worker) as executor, \
+                ThreadPoolExecutor(max_workers=1) as table_executor:
+            # map submits every plot up front, so the workers are forked before the table thread starts
+            results = executor.map(_run_plot, PLOT_FUNCTIONS.values())
+            # The teacher table needs no plots, so build it while the workers render
+            table_future = table_executor.submit(generate_teacher_table)
+            images = dict(zip(PLOT_FUNCTIONS, results))
+            table_future.result()
+        generate_final_report(images)  # Add this line
         print(f"All outputs generated successfully in '{OUTPUT_DIR}' directory")
     except Exception as e:
         print(f"Error generating outputs: {str(e)}")
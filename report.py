@@ -1,78 +1,122 @@
 import os
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = None
+
+def _read_csv(path, usecols, dtype, parse_dates):
+    if pa is None:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype, parse_dates=parse_dates)
+    
+    # Arrow's multithreaded reader decodes straight into typed columns. Text columns are
+    # typed up front, otherwise ids like 00000001 would be inferred as integers.
+    column_types = {col: pa.string() for col, col_type in dtype.items() if col_type in ('category', 'string')}
+    column_types.update({col: pa.timestamp('ns') for col in parse_dates})
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+        include_columns=usecols,
+        column_types=column_types,
+        strings_can_be_null=True
+    ))
+    return table.to_pandas().astype(dtype)
+
 class ClassUsageReporter:
     def __init__(self, past_classes_csv, missed_classes_csv, teachers_csv):
-        # Read the CSV files
-        self.past_classes = pd.read_csv(past_classes_csv, parse_dates=['created_at', 'start_time', 'end_time', 'date_taken'])
+        # Read only the columns the analyses use, with compact dtypes. Low-cardinality keys
+        # are categorical; employee_id is read as text so leading zeros match across files.
+        self.past_classes = _read_csv(
+            past_classes_csv,
+            usecols=['id', 'employee_id', 'course_code', 'section', 'room_id', 'entry_type',
+                     'remarks', 'start_time', 'end_time', 'date_taken'],
+            dtype={'id': 'int32', 'employee_id': 'category', 'course_code': 'category',
+                   'section': 'category', 'room_id': 'category', 'entry_type': 'category'},
+            parse_dates=['start_time', 'end_time', 'date_taken']
+        )
         
-        self.missed_classes = pd.read_csv(missed_classes_csv, parse_dates=['created_at', 'date_missed'])
-        self.teachers = pd.read_csv(teachers_csv)
+        self.missed_classes = _read_csv(
+            missed_classes_csv,
+            usecols=['id', 'employee_id', 'course_code', 'date_missed', 'makeup_done'],
+            dtype={'id': 'int32', 'employee_id': 'category', 'course_code': 'category', 'makeup_done': 'bool'},
+            parse_dates=['date_missed']
+        )
+        self.teachers = _read_csv(
+            teachers_csv,
+            usecols=['employee_id', 'first_name', 'last_name'],
+            dtype={'employee_id': 'category', 'first_name': 'string', 'last_name': 'string'},
+            parse_dates=[]
+        )
         
-        # Convert employee_id to string in all dataframes
-        self.past_classes['employee_id'] = self.past_classes['employee_id'].astype(str)
-        self.missed_classes['employee_id'] = self.missed_classes['employee_id'].astype(str)
-        self.teachers['employee_id'] = self.teachers['employee_id'].astype(str)
+        # Give employee_id the same categories in all three frames so joins and isin compare codes
+        employee_ids = union_categoricals(
+            [self.past_classes['employee_id'], self.missed_classes['employee_id'], self.teachers['employee_id']],
+            sort_categories=True
+        )
+        employee_dtype = pd.CategoricalDtype(employee_ids.categories)
+        for df in (self.past_classes, self.missed_classes, self.teachers):
+            df['employee_id'] = df['employee_id'].astype(employee_dtype)
         
         # Filter out "CLASS ENDED BY SYSTEM" rows and calculate duration
         self.past_classes = self.past_classes[self.past_classes['remarks'] != "CLASS ENDED BY SYSTEM"]
-        self.past_classes['duration'] = (self.past_classes['end_time'] - self.past_classes['start_time']).dt.total_seconds() / 60
+        # Subtract the raw datetime64 arrays and divide by one minute to get float minutes
+        start_time = self.past_classes['start_time'].to_numpy()
+        end_time = self.past_classes['end_time'].to_numpy()
+        self.past_classes['duration'] = (end_time - start_time) / np.timedelta64(1, 'm')
         self._identify_lab_classes()
+        
+        # Late-entry flag computed once and shared by the analyses
+        self.past_classes['is_late'] = self.past_classes['entry_type'].to_numpy() == 'late'
+        
+        # Teacher names indexed by id, attached to per-teacher results with .map
+        self._teacher_name = self.teachers.dropna(subset=['employee_id']).set_index('employee_id')[['first_name', 'last_name']]
     
     def _identify_lab_classes(self):
-        # First identify by duration
-        self.past_classes['class_type'] = self.past_classes['duration'].apply(
-            lambda x: 'lab' if x >= 150 else 'theory'  # Using 150 minutes as threshold
-        )
+        # First identify by duration, using 150 minutes as threshold. Codes index into
+        # ['lab', 'theory'], kept alphabetical so sorting by class_type is unchanged.
+        codes = np.where(self.past_classes['duration'].to_numpy() >= 150, 0, 1).astype(np.int8)
         
-        # Then check for multiple occurrences
-        class_counts = self.past_classes.groupby([
+        # Then check for multiple occurrences, broadcasting each group's size back to its rows
+        self.past_classes['count'] = self.past_classes.groupby([
             'date_taken', 'section', 'room_id', 'course_code', 'employee_id'
-        ]).size().reset_index(name='count')
-        
-        # Map the counts back to original dataframe
-        self.past_classes = self.past_classes.merge(
-            class_counts,
-            on=['date_taken', 'section', 'room_id', 'course_code', 'employee_id'],
-            how='left'
-        )
+        ], observed=True, sort=False)['id'].transform('size')
         
         # Update class type if multiple occurrences found
-        self.past_classes.loc[self.past_classes['count'] >= 2, 'class_type'] = 'lab'
+        codes[self.past_classes['count'].to_numpy() >= 2] = 0
+        self.past_classes['class_type'] = pd.Categorical.from_codes(codes, categories=['lab', 'theory'])
     
     def _past_classes_analysis(self):
         total_classes = len(self.past_classes)
-        late_classes = len(self.past_classes[self.past_classes['entry_type'] == 'late'])
-        on_time_classes = len(self.past_classes[self.past_classes['entry_type'] == 'on_time'])
-        extra_classes = len(self.past_classes[self.past_classes['entry_type'] == 'EXTRA_CLASS'])
-        
-        # Create copy for duration calculations
-        duration_filtered = self.past_classes.copy()
-        theory_mask = (duration_filtered['class_type'] == 'theory') & (duration_filtered['duration'] <= 80)
-        lab_mask = (duration_filtered['class_type'] == 'lab') & (duration_filtered['duration'] <= 170)
-        duration_filtered = duration_filtered[theory_mask | lab_mask]
-        
-        # Use unfiltered data for class counts
-        course_stats = self.past_classes.groupby(['course_code', 'class_type']).agg({
-            'id': 'count'
-        }).reset_index()
-        
-        # Use filtered data for duration calculations
-        duration_stats = duration_filtered.groupby(['course_code', 'class_type']).agg({
-            'duration': 'mean'
-        }).reset_index()
-        
-        # Merge count and duration stats
-        course_stats = course_stats.merge(
-            duration_stats[['course_code', 'class_type', 'duration']], 
-            on=['course_code', 'class_type'], 
-            how='left'
-        )
         
-        course_stats.columns = ['course_code', 'class_type', 'class_count', 'avg_duration']
+        # Count every entry type in a single pass
+        entry_counts = self.past_classes['entry_type'].value_counts()
+        late_classes = int(entry_counts.get('late', 0))
+        on_time_classes = int(entry_counts.get('on_time', 0))
+        extra_classes = int(entry_counts.get('EXTRA_CLASS', 0))
+        
+        # Only durations within the expected range for the class type count towards averages
+        theory_mask = (self.past_classes['class_type'] == 'theory') & (self.past_classes['duration'] <= 80)
+        lab_mask = (self.past_classes['class_type'] == 'lab') & (self.past_classes['duration'] <= 170)
+        filtered_duration = self.past_classes['duration'].where(theory_mask | lab_mask)
+        
+        # Count all classes and average the filtered durations in a single groupby
+        course_stats = self.past_classes.assign(filtered_duration=filtered_duration).groupby(
+            ['course_code', 'class_type'], observed=True
+        ).agg(
+            class_count=('id', 'size'),
+            avg_duration=('filtered_duration', 'mean')
+        ).reset_index()
+        
         course_stats = course_stats.sort_values(['class_type', 'class_count'], ascending=[True, False])
         
         entry_type_dist = {
@@ -82,7 +126,7 @@ class ClassUsageReporter:
         }
         
         # Calculate average durations using filtered data
-        avg_durations = duration_filtered.groupby('class_type')['duration'].mean().to_dict()
+        avg_durations = filtered_duration.dropna().groupby(self.past_classes['class_type'], observed=True).mean().to_dict()
         
         return {
             'total_classes': total_classes,
@@ -95,19 +139,15 @@ class ClassUsageReporter:
         }
     
     def _missed_classes_analysis(self):
-        teacher_missed = self.missed_classes.merge(
-            self.teachers[['employee_id', 'first_name', 'last_name']],
-            on='employee_id',
-            how='left'
-        )
+        # Count per teacher id; ids with no teacher record get no name and are dropped below
+        missed_counts = self.missed_classes.groupby('employee_id', observed=True).size().reset_index(name='missed_count')
         
-        teachers_with_most_missed = teacher_missed.groupby(
-            ['employee_id', 'first_name', 'last_name']
-        )['id'].count().reset_index(name='missed_count')
+        missed_counts.insert(1, 'first_name', missed_counts['employee_id'].map(self._teacher_name['first_name']))
+        missed_counts.insert(2, 'last_name', missed_counts['employee_id'].map(self._teacher_name['last_name']))
+        teachers_with_most_missed = missed_counts.dropna(subset=['first_name', 'last_name'])
         
-        teachers_with_most_missed = teachers_with_most_missed.sort_values(
-            'missed_count', ascending=False
-        )
+        # Only the top 10 are reported, so select them without sorting every teacher
+        teachers_with_most_missed = teachers_with_most_missed.nlargest(10, 'missed_count')
         
         return {
             'total_missed_classes': len(self.missed_classes),
@@ -115,26 +155,35 @@ class ClassUsageReporter:
         }
     
     def _teacher_usage_analysis(self):
-        teacher_metrics = self.past_classes.merge(
-            self.teachers[['employee_id', 'first_name', 'last_name']],
-            on='employee_id',
-            how='left'
-        )
-        
-        teacher_stats = teacher_metrics.groupby(
-            ['employee_id', 'first_name', 'last_name']
-        ).agg({
-            'id': 'count',
-            'entry_type': lambda x: (x == 'late').sum()
-        }).reset_index()
-        
-        teacher_stats.columns = ['employee_id', 'first_name', 'last_name', 'total_classes', 'late_classes']
-        
-        missed_counts = self.missed_classes.groupby('employee_id')['id'].count().reset_index(name='missed_classes')
-        teacher_stats = teacher_stats.merge(missed_counts, on='employee_id', how='left')
+        # Roll up classes per teacher with bincount over the shared employee_id codes,
+        # then look up names on the much smaller result
+        employee_ids = self.past_classes['employee_id']
+        codes = employee_ids.cat.codes.to_numpy()
+        known = codes >= 0
+        n_ids = len(employee_ids.cat.categories)
+        total = np.bincount(codes[known], minlength=n_ids)
+        late = np.bincount(
+            codes[known], weights=self.past_classes['is_late'].to_numpy()[known], minlength=n_ids
+        ).astype(np.int64)
+        observed = np.flatnonzero(total)
+        teacher_stats = pd.DataFrame({
+            'employee_id': pd.Categorical.from_codes(observed, dtype=employee_ids.dtype),
+            'total_classes': total[observed],
+            'late_classes': late[observed]
+        })
+        teacher_stats.insert(1, 'first_name', teacher_stats['employee_id'].map(self._teacher_name['first_name']))
+        teacher_stats.insert(2, 'last_name', teacher_stats['employee_id'].map(self._teacher_name['last_name']))
+        teacher_stats = teacher_stats.dropna(subset=['first_name', 'last_name'])
+        
+        # Missed counts stay indexed by employee_id so they join onto the rollup by index
+        missed_counts = self.missed_classes.groupby('employee_id', observed=True).size().rename('missed_classes')
+        teacher_stats = teacher_stats.join(missed_counts, on='employee_id', how='left', validate='m:1')
         teacher_stats['missed_classes'] = teacher_stats['missed_classes'].fillna(0)
         
-        teacher_stats['late_percentage'] = (teacher_stats['late_classes'] / teacher_stats['total_classes']) * 100
+        # Divide only where there are classes, leaving 0 instead of NaN elsewhere
+        late = teacher_stats['late_classes'].to_numpy(dtype=np.float64)
+        total = teacher_stats['total_classes'].to_numpy(dtype=np.float64)
+        teacher_stats['late_percentage'] = np.divide(late, total, out=np.zeros_like(late), where=total > 0) * 100
         
         return {
             'total_summary': {
@@ -152,9 +201,18 @@ class ClassUsageReporter:
             'teacher_usage': self._teacher_usage_analysis()
         }
         
-        with open(os.path.join(output_dir, 'comprehensive_report.json'), 'w') as f:
-            import json
-            json.dump(report, f, indent=4, default=str)
+        report_path = os.path.join(output_dir, 'comprehensive_report.json')
+        if orjson is not None:
+            with open(report_path, 'wb') as f:
+                # numpy scalars from pandas are serialized natively, no str() fallback needed
+                f.write(orjson.dumps(
+                    report,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(report_path, 'w') as f:
+                import json
+                json.dump(report, f, indent=4, default=str)
         
         return report
 